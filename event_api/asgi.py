@@ -11,3 +11,10 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "event_api.settings")
 
 application = get_asgi_application()
 
+# Preloaded / forked worker mode: warm URL resolvers, serializers and the JWT
+# backend once in the master so forked workers share them (see event_api/preload.py).
+if os.environ.get("EVENT_API_PRELOAD") == "1":
+    from event_api.preload import warm
+
+    warm()
+
@@ -0,0 +1,49 @@
+"""
+Warm-up for the preloaded / forked worker mode.
+
+With EVENT_API_PRELOAD=1, event_api/wsgi.py and asgi.py call warm() once in the
+master process (e.g. `gunicorn --preload event_api.wsgi`). Everything imported and
+built here is shared copy-on-write with every forked worker, so workers start
+serving without paying for it again.
+"""
+import gc
+
+from django.db import connections
+
+
+def warm_urls():
+    """Import every urlconf and build the reverse lookup tables."""
+    from django.urls import get_resolver
+    resolver = get_resolver()
+    resolver.reverse_dict  # populates the whole tree
+
+
+def warm_serializers():
+    """Build the field plans of the API serializers so model metadata and field classes are cached."""
+    from events.serializers import (
+        UserSerializer, UserProfileSerializer, EventSerializer, RSVPSerializer, ReviewSerializer,
+    )
+    for serializer_class in (UserSerializer, UserProfileSerializer, EventSerializer, RSVPSerializer, ReviewSerializer):
+        serializer_class().fields
+
+
+def warm_auth():
+    """Load the DRF authentication classes and the JWT token backend."""
+    from rest_framework.settings import api_settings
+    from rest_framework_simplejwt.state import token_backend
+    api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    api_settings.DEFAULT_PERMISSION_CLASSES
+    api_settings.DEFAULT_FILTER_BACKENDS
+    # importing state builds the TokenBackend (and loads PyJWT) for the configured algorithm
+    token_backend.get_leeway()
+
+
+def warm():
+    warm_urls()
+    warm_serializers()
+    warm_auth()
+    # never share a database connection across fork()
+    connections.close_all()
+    # move everything loaded so far out of the GC's reach, so collections in the
+    # workers don't touch (and copy) the shared pages
+    gc.freeze()
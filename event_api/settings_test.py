@@ -0,0 +1,26 @@
+"""
+Settings profile for the test suite: `python manage.py test` picks it up by default
+(see manage.py). Same apps and REST config as settings.py, tuned for fast test runs.
+"""
+
+from .settings import *
+
+DEBUG = False
+
+# In-memory SQLite: nothing to create on disk, nothing to clean up. The events app
+# ships a squashed initial migration, so a fresh test DB applies one migration for it.
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+        'OPTIONS': DATABASES['default']['OPTIONS'],
+        'TEST': {
+            'NAME': ':memory:',
+        },
+    }
+}
+
+# Password hashing is deliberately slow; tests create users constantly.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
@@ -1,7 +1,63 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.db import transaction
 from .models import UserProfile, Event, RSVP, Review
+from .services import change_capacity, set_rsvp_status
+
+
+class EventAdminForm(forms.ModelForm):
+    class Meta:
+        model = Event
+        fields = '__all__'
+
+    def clean_capacity(self):
+        capacity = self.cleaned_data['capacity']
+        if self.instance.pk is not None and capacity is not None:
+            seats_taken = Event.objects.filter(pk=self.instance.pk).values_list('seats_taken', flat=True).first()
+            if seats_taken is not None and capacity < seats_taken:
+                raise forms.ValidationError(f'capacity cannot be lower than the seats already taken ({seats_taken})')
+        return capacity
+
+
+class EventAdmin(admin.ModelAdmin):
+    form = EventAdminForm
+    list_display = ('title', 'organizer', 'start_time', 'capacity', 'seats_taken')
+    readonly_fields = ('seats_taken',)
+
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            # Event.save() leaves capacity alone on existing rows; it is changed below
+            super().save_model(request, obj, form, change)
+            if change and 'capacity' in form.changed_data and not change_capacity(obj, form.cleaned_data['capacity']):
+                # seats were claimed between validating the form and saving it
+                self.message_user(request, 'Capacity not changed: it is lower than the seats already taken.',
+                                  level=messages.ERROR)
+
+
+class RSVPAdmin(admin.ModelAdmin):
+    list_display = ('user', 'event', 'status', 'waitlisted_at')
+    list_filter = ('status',)
+
+    def get_readonly_fields(self, request, obj=None):
+        # seats are only claimed / released through the allocator; change status via the API
+        if obj is not None:
+            return ('event', 'user', 'status', 'waitlisted_at')
+        return ('waitlisted_at',)
+
+    def formfield_for_choice_field(self, db_field, request, **kwargs):
+        if db_field.name == 'status':
+            kwargs['choices'] = [(s, s) for s in RSVP.REQUESTABLE_STATUSES]
+        return super().formfield_for_choice_field(db_field, request, **kwargs)
+
+    def save_model(self, request, obj, form, change):
+        if change:
+            # every editable field is read-only on change, so there is nothing to write
+            return
+        rsvp = set_rsvp_status(obj.event, obj.user, obj.status)
+        obj.pk, obj.status, obj.waitlisted_at = rsvp.pk, rsvp.status, rsvp.waitlisted_at
+
 
 admin.site.register(UserProfile)
-admin.site.register(Event)
-admin.site.register(RSVP)
+admin.site.register(Event, EventAdmin)
+admin.site.register(RSVP, RSVPAdmin)
 admin.site.register(Review)
@@ -0,0 +1,116 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+from django.utils import timezone
+
+from events.models import Event
+from events.services import RSVPConflict, set_rsvp_status
+
+# a client retries a 409 / "database is locked" this many times, RETRY_DELAY seconds apart, then gives up
+MAX_RETRIES = 1000
+RETRY_DELAY = 0.001
+
+
+def run_rsvp_stress(event, users, threads, rounds=1):
+    """
+    Hammer one event from `threads` worker threads. Every user asks for "Going",
+    and in each extra round switches to "Not Going" and back, so seats are claimed,
+    released and handed to the waitlist concurrently.
+    Returns a dict with timing and outcome counts; re-raises the first error of any
+    worker, including a request that still failed after MAX_RETRIES retries.
+    """
+    plan = ['Going'] + ['Not Going', 'Going'] * (rounds - 1)
+    chunks = [users[i::threads] for i in range(threads)]
+    stats = {'requests': 0, 'retries': 0}
+    errors = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(threads)
+
+    def worker(chunk):
+        requests = retries = 0
+        try:
+            start_gate.wait()
+            for status_val in plan:
+                for user in chunk:
+                    attempts = 0
+                    while True:
+                        try:
+                            set_rsvp_status(event, user, status_val)
+                            break
+                        except (RSVPConflict, OperationalError):
+                            attempts += 1
+                            if attempts > MAX_RETRIES:
+                                raise
+                            time.sleep(RETRY_DELAY)
+                    retries += attempts
+                    requests += 1
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connections.close_all()
+            with lock:
+                stats['requests'] += requests
+                stats['retries'] += retries
+
+    workers = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    stats['elapsed'] = time.perf_counter() - started
+    if errors:
+        raise errors[0]
+
+    event.refresh_from_db()
+    rsvps = event.rsvps.all()
+    stats['capacity'] = event.capacity
+    stats['seats_taken'] = event.seats_taken
+    stats['going'] = rsvps.filter(status='Going').count()
+    stats['waitlisted'] = rsvps.filter(status='Waitlisted').count()
+    return stats
+
+
+class Command(BaseCommand):
+    help = "Stress the RSVP seat allocator on one event and report throughput and oversell checks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--capacity', type=int, default=50)
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--rounds', type=int, default=2,
+                            help="1 = everyone asks for Going once; each extra round adds a Not Going/Going flip")
+
+    def handle(self, *args, **options):
+        tag = f"rsvp-stress-{int(time.time())}"
+        users = [User.objects.create(username=f"{tag}-{i}") for i in range(options['users'])]
+        now = timezone.now()
+        event = Event.objects.create(
+            title=tag,
+            organizer=users[0],
+            start_time=now + timedelta(days=1),
+            end_time=now + timedelta(days=1, hours=2),
+            capacity=options['capacity'],
+        )
+        try:
+            stats = run_rsvp_stress(event, users, options['threads'], options['rounds'])
+        finally:
+            # fixtures are throwaway; cascades remove the event and RSVPs too
+            User.objects.filter(username__startswith=tag).delete()
+
+        self.stdout.write(
+            f"{stats['requests']} RSVP updates in {stats['elapsed']:.2f}s "
+            f"({stats['requests'] / stats['elapsed']:.0f}/s) with {options['threads']} threads, "
+            f"{stats['retries']} retries"
+        )
+        self.stdout.write(
+            f"capacity={stats['capacity']} seats_taken={stats['seats_taken']} "
+            f"going={stats['going']} waitlisted={stats['waitlisted']}"
+        )
+        if stats['going'] > stats['capacity'] or stats['going'] != stats['seats_taken']:
+            raise CommandError('oversold: seat counter and Going RSVPs disagree with capacity')
+        self.stdout.write(self.style.SUCCESS('no oversell'))
@@ -0,0 +1,173 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+TARGETS = {
+    'wsgi': 'event_api.wsgi',
+    'asgi': 'event_api.asgi',
+}
+
+
+def worker_snippet(module, path):
+    # what a fresh worker does before it can answer its first request
+    return f"import {module}\nfrom django.urls import resolve\nresolve({path!r})\n"
+
+
+def forked_snippet(module, path, forks):
+    # preloaded master: import + warm once, then time fork() until the child has resolved `path`;
+    # prints "<ms> <child exit code>" per fork
+    return (
+        f"import os, time, traceback\nimport {module}\nfrom django.urls import resolve\n"
+        f"for _ in range({forks}):\n"
+        f"    started = time.perf_counter()\n"
+        f"    pid = os.fork()\n"
+        f"    if pid == 0:\n"
+        f"        try:\n"
+        f"            resolve({path!r})\n"
+        f"        except BaseException:\n"
+        f"            traceback.print_exc()\n"
+        f"            os._exit(1)\n"
+        f"        os._exit(0)\n"
+        f"    _, status = os.waitpid(pid, 0)\n"
+        f"    print((time.perf_counter() - started) * 1000, os.waitstatus_to_exitcode(status), flush=True)\n"
+    )
+
+
+def run_worker(module, path, env, importtime=False):
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ['-X', 'importtime']
+    cmd += ['-c', worker_snippet(module, path)]
+    started = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise CommandError(f"worker for {module} failed:\n{proc.stderr}")
+    return elapsed, proc.stderr
+
+
+def run_forked(module, path, env, forks):
+    """Time `forks` workers forked from a preloaded master; raises CommandError if any of them fails."""
+    proc = subprocess.run([sys.executable, '-c', forked_snippet(module, path, forks)],
+                          cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise CommandError(f"preloaded master for {module} failed:\n{proc.stderr}")
+    timings = []
+    for line in proc.stdout.splitlines():
+        elapsed, exit_code = line.split()
+        if int(exit_code) != 0:
+            raise CommandError(f"forked worker for {module} exited with {exit_code}:\n{proc.stderr}")
+        timings.append(float(elapsed))
+    return timings
+
+
+def parse_importtime(output):
+    """Parse `-X importtime` stderr into (module, self_us, cumulative_us) tuples."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return rows
+
+
+def profile_target(module, path, repeat, preload=False):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+    if preload:
+        env['EVENT_API_PRELOAD'] = '1'
+    else:
+        env.pop('EVENT_API_PRELOAD', None)
+
+    timings = [run_worker(module, path, env)[0] * 1000 for _ in range(repeat)]
+    rows = parse_importtime(run_worker(module, path, env, importtime=True)[1])
+
+    forked = None
+    if preload and hasattr(os, 'fork'):
+        forked = run_forked(module, path, env, repeat)
+
+    packages = defaultdict(int)
+    for name, self_us, _ in rows:
+        packages[name.split('.')[0]] += self_us
+    return {
+        'module': module,
+        'path': path,
+        'preload': preload,
+        'cold_start_ms': {
+            'min': round(min(timings), 1),
+            'median': round(statistics.median(timings), 1),
+            'max': round(max(timings), 1),
+            'runs': repeat,
+        },
+        'forked_worker_ready_ms': forked and {
+            'min': round(min(forked), 1),
+            'median': round(statistics.median(forked), 1),
+            'max': round(max(forked), 1),
+            'runs': repeat,
+        },
+        'modules_imported': len(rows),
+        'import_ms': round(sum(self_us for _, self_us, _ in rows) / 1000, 1),
+        'packages_ms': {name: round(us / 1000, 1) for name, us in sorted(packages.items(), key=lambda kv: -kv[1])},
+        'slowest_modules_ms': [(name, round(self_us / 1000, 1))
+                               for name, self_us, _ in sorted(rows, key=lambda r: -r[1])],
+    }
+
+
+class Command(BaseCommand):
+    help = ("Measure worker cold start for the WSGI/ASGI entry points and report where "
+            "import time goes, using `python -X importtime`.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', choices=[*TARGETS, 'all'], default='all')
+        parser.add_argument('--repeat', type=int, default=10, help="timed cold starts per target")
+        parser.add_argument('--top', type=int, default=15, help="rows to show in each table")
+        parser.add_argument('--path', default='/api/events/', help="URL the worker resolves before it counts as ready")
+        parser.add_argument('--preload', action='store_true',
+                            help="profile with EVENT_API_PRELOAD=1 (the cost a preloading master pays once) "
+                                 "and time workers forked from it")
+        parser.add_argument('--json', action='store_true', help="print machine-readable results for benchmark tracking")
+
+    def handle(self, *args, **options):
+        targets = list(TARGETS) if options['target'] == 'all' else [options['target']]
+        results = {
+            name: profile_target(TARGETS[name], options['path'], options['repeat'], options['preload'])
+            for name in targets
+        }
+
+        if options['json']:
+            for result in results.values():
+                result['slowest_modules_ms'] = result['slowest_modules_ms'][:options['top']]
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for name, result in results.items():
+            cold = result['cold_start_ms']
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{name} ({result['module']}, resolve {result['path']}"
+                f"{', preload' if result['preload'] else ''})"
+            ))
+            self.stdout.write(
+                f"  cold start: median {cold['median']}ms, min {cold['min']}ms, max {cold['max']}ms over {cold['runs']} runs"
+            )
+            forked = result['forked_worker_ready_ms']
+            if forked:
+                self.stdout.write(
+                    f"  forked worker ready: median {forked['median']}ms, min {forked['min']}ms, "
+                    f"max {forked['max']}ms over {forked['runs']} forks of a preloaded master"
+                )
+            self.stdout.write(f"  {result['modules_imported']} modules, {result['import_ms']}ms spent importing")
+            self.stdout.write("  by package:")
+            for package, ms in list(result['packages_ms'].items())[:options['top']]:
+                self.stdout.write(f"    {ms:8.1f}ms  {package}")
+            self.stdout.write("  slowest modules (self time):")
+            for module, ms in result['slowest_modules_ms'][:options['top']]:
+                self.stdout.write(f"    {ms:8.1f}ms  {module}")
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.9 on 2026-10-19 20:24
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_seats_taken(apps, schema_editor):
+    # existing 'Going' RSVPs already hold a seat
+    Event = apps.get_model('events', 'Event')
+    RSVP = apps.get_model('events', 'RSVP')
+    going = RSVP.objects.filter(event=models.OuterRef('pk'), status='Going').order_by().values('event')
+    Event.objects.update(
+        seats_taken=Coalesce(
+            models.Subquery(going.annotate(n=models.Count('pk')).values('n')), 0
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='seats_taken',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='rsvp',
+            name='waitlisted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='rsvp',
+            name='status',
+            field=models.CharField(choices=[('Going', 'Going'), ('Maybe', 'Maybe'), ('Not Going', 'Not Going'), ('Waitlisted', 'Waitlisted')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='rsvp',
+            index=models.Index(fields=['event', 'status', 'waitlisted_at'], name='events_rsvp_event_i_089cce_idx'),
+        ),
+        # only needed for databases that already have RSVPs, so squashing can drop it
+        migrations.RunPython(backfill_seats_taken, migrations.RunPython.noop, elidable=True),
+    ]
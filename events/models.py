@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F, Q
 from django.contrib.auth.models import User
 
 class UserProfile(models.Model):
@@ -20,25 +21,78 @@ class Event(models.Model):
     end_time = models.DateTimeField()
     is_public = models.BooleanField(default=True)
     invited = models.ManyToManyField(User, related_name='invited_events', blank=True)
+    # null capacity means unlimited; seats_taken is only ever changed through claim_seat/release_seat
+    capacity = models.PositiveIntegerField(null=True, blank=True)
+    seats_taken = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.title} ({self.organizer.username})"
 
+    # only ever changed through set_capacity / claim_seat / release_seat
+    SEAT_FIELDS = ('capacity', 'seats_taken')
+
+    def save(self, *args, **kwargs):
+        # saving a (possibly stale) loaded instance must never write the seat fields back:
+        # seats claimed, or capacity changed, since it was loaded would be lost or oversold
+        if not self._state.adding:
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                update_fields = [f.name for f in self._meta.concrete_fields if not f.primary_key]
+            kwargs['update_fields'] = [name for name in update_fields if name not in self.SEAT_FIELDS]
+        super().save(*args, **kwargs)
+
+    def set_capacity(self, capacity):
+        """
+        Atomically change capacity unless fewer seats than that are free to take it:
+        the check runs against the live counter in the same UPDATE. Returns True on success.
+        """
+        qs = Event.objects.filter(pk=self.pk)
+        if capacity is not None:
+            qs = qs.filter(seats_taken__lte=capacity)
+        changed = qs.update(capacity=capacity) == 1
+        if changed:
+            self.capacity = capacity
+        return changed
+
+    def claim_seat(self):
+        """
+        Atomically take one seat if any are left. Returns True when a seat was claimed.
+        A single conditional UPDATE decides this in the database, so concurrent callers
+        can never push seats_taken past capacity.
+        """
+        claimed = Event.objects.filter(pk=self.pk).filter(
+            Q(capacity__isnull=True) | Q(seats_taken__lt=F('capacity'))
+        ).update(seats_taken=F('seats_taken') + 1)
+        return claimed == 1
+
+    def release_seat(self):
+        """Atomically give one seat back. Returns True when a seat was released."""
+        released = Event.objects.filter(pk=self.pk, seats_taken__gt=0).update(seats_taken=F('seats_taken') - 1)
+        return released == 1
+
 class RSVP(models.Model):
     STATUS_CHOICES = (
         ('Going','Going'),
         ('Maybe','Maybe'),
         ('Not Going','Not Going'),
+        ('Waitlisted','Waitlisted'),
     )
+    # statuses a user may ask for; 'Waitlisted' is only ever assigned by the seat allocator
+    REQUESTABLE_STATUSES = ('Going', 'Maybe', 'Not Going')
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='rsvps')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='rsvps')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    # set when the RSVP joins the waitlist; the waitlist is promoted oldest first
+    waitlisted_at = models.DateTimeField(null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('event','user')
+        indexes = [
+            models.Index(fields=['event', 'status', 'waitlisted_at']),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.event.title} ({self.status})"
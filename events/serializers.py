@@ -1,6 +1,8 @@
+from django.db import transaction
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from .models import UserProfile, Event, RSVP, Review
+from .services import change_capacity
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -19,8 +21,8 @@ class EventSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Event
-        fields = ['id','title','description','organizer','location','start_time','end_time','is_public','invited','created_at','updated_at']
-        read_only_fields = ['id','organizer','created_at','updated_at']
+        fields = ['id','title','description','organizer','location','start_time','end_time','is_public','invited','capacity','seats_taken','created_at','updated_at']
+        read_only_fields = ['id','organizer','seats_taken','created_at','updated_at']
 
     def create(self, validated_data):
         invited = validated_data.pop('invited', [])
@@ -36,12 +38,27 @@ class EventSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('start_time must be before end_time')
         return data
 
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            # checked against the live seat counter, not the copy loaded for this request;
+            # seats freed by a raised capacity go to the waitlist in the same transaction
+            if 'capacity' in validated_data and not change_capacity(instance, validated_data.pop('capacity')):
+                raise serializers.ValidationError({'capacity': 'capacity cannot be lower than the seats already taken'})
+            instance = super().update(instance, validated_data)
+        instance.refresh_from_db(fields=['capacity', 'seats_taken'])
+        return instance
+
 class RSVPSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     class Meta:
         model = RSVP
-        fields = ['id','event','user','status','updated_at']
-        read_only_fields = ['id','user','updated_at','event']
+        fields = ['id','event','user','status','waitlisted_at','updated_at']
+        read_only_fields = ['id','user','waitlisted_at','updated_at','event']
+
+    def validate_status(self, value):
+        if value not in RSVP.REQUESTABLE_STATUSES:
+            raise serializers.ValidationError('invalid status (choose Going / Maybe / Not Going)')
+        return value
 
 class ReviewSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
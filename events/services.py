@@ -0,0 +1,86 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .models import RSVP
+
+
+class RSVPConflict(Exception):
+    """Raised when the RSVP was changed by a concurrent request while we were updating it."""
+
+
+def set_rsvp_status(event, user, status_val):
+    """
+    Create or update user's RSVP for event and keep the seat counter in step.
+
+    'Going' claims a seat with Event.claim_seat(); if the event is full the RSVP is
+    put on the waitlist instead. Leaving 'Going' releases the seat and promotes the
+    waitlist. The RSVP row itself is moved with a conditional UPDATE on its previous
+    status, so two racing requests for the same RSVP can't both claim (or release) a seat.
+    """
+    with transaction.atomic():
+        rsvp, created = RSVP.objects.get_or_create(
+            event=event,
+            user=user,
+            defaults={'status': 'Not Going'}
+        )
+        old = rsvp.status
+        if status_val == old:
+            return rsvp
+
+        now = timezone.now()
+        waitlisted_at = None
+        if status_val == 'Going' and not event.claim_seat():
+            if old == 'Waitlisted':
+                # still full; keep the existing place in the queue
+                return rsvp
+            status_val = 'Waitlisted'
+            waitlisted_at = now
+
+        moved = RSVP.objects.filter(pk=rsvp.pk, status=old).update(
+            status=status_val, waitlisted_at=waitlisted_at, updated_at=now
+        )
+        if not moved:
+            # raising rolls back any seat we claimed above
+            raise RSVPConflict()
+
+        if old == 'Going':
+            event.release_seat()
+            promote_waitlist(event)
+
+    rsvp.status, rsvp.waitlisted_at, rsvp.updated_at = status_val, waitlisted_at, now
+    return rsvp
+
+
+def change_capacity(event, capacity):
+    """
+    Set event's capacity and hand any seats it frees to the waitlist, in one transaction,
+    so a new "Going" can't take them ahead of people already waiting.
+    Returns False (and changes nothing) if capacity is below the seats already taken.
+    """
+    with transaction.atomic():
+        if not event.set_capacity(capacity):
+            return False
+        promote_waitlist(event)
+    return True
+
+
+def promote_waitlist(event):
+    """
+    Move waitlisted RSVPs to 'Going', oldest first, while the event has free seats.
+    Returns the number of RSVPs promoted.
+    """
+    promoted = 0
+    with transaction.atomic():
+        while True:
+            candidate = (event.rsvps.filter(status='Waitlisted')
+                         .order_by('waitlisted_at', 'pk').only('pk').first())
+            if candidate is None or not event.claim_seat():
+                return promoted
+            moved = RSVP.objects.filter(pk=candidate.pk, status='Waitlisted').update(
+                status='Going', waitlisted_at=None, updated_at=timezone.now()
+            )
+            if moved:
+                promoted += 1
+            else:
+                # candidate left the waitlist in the meantime; hand the seat back and try the next one
+                event.release_seat()
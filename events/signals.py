@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Event, RSVP
+from .services import promote_waitlist
+
+
+@receiver(post_delete, sender=RSVP)
+def release_seat_of_deleted_rsvp(sender, instance, **kwargs):
+    """
+    A deleted 'Going' RSVP (directly, or by cascade when its user is deleted)
+    gives its seat back to the event and the waitlist moves up.
+    """
+    if instance.status != 'Going':
+        return
+    event_id = instance.event_id
+
+    def release():
+        # The event may be going away in the same delete: directly, as part of a
+        # queryset delete, or by cascade from its organizer. Its RSVPs are deleted
+        # before the event itself, so only after commit do we know whether it survived.
+        event = Event.objects.filter(pk=event_id).first()
+        if event is not None and event.release_seat():
+            promote_waitlist(event)
+
+    transaction.on_commit(release)
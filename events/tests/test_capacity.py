@@ -0,0 +1,334 @@
+# events/tests/test_capacity.py
+import threading
+import time
+from django.urls import reverse
+from django.db import OperationalError, connections
+from django.test import TransactionTestCase
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth import get_user_model
+from events.models import Event, RSVP
+from events.serializers import EventSerializer
+from events.management.commands.rsvp_stress import MAX_RETRIES, RETRY_DELAY, run_rsvp_stress
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from django.utils import timezone
+from datetime import timedelta
+
+User = get_user_model()
+
+
+class EventCapacityTestCase(APITestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username="organizer", password="pass12345")
+        self.users = [User.objects.create_user(username=f"guest{i}", password="pass12345") for i in range(3)]
+        self.start = timezone.now() + timedelta(days=1)
+        self.event = Event.objects.create(
+            title="Small",
+            organizer=self.organizer,
+            start_time=self.start,
+            end_time=self.start + timedelta(hours=2),
+            capacity=2
+        )
+        self.url = reverse("events-rsvp", args=[self.event.id])
+
+    def rsvp(self, user, status_val):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client.post(self.url, {"status": status_val}, format="json")
+
+    def test_going_claims_seat_and_full_event_waitlists(self):
+        self.assertEqual(self.rsvp(self.users[0], "Going").json()["status"], "Going")
+        self.assertEqual(self.rsvp(self.users[1], "Going").json()["status"], "Going")
+        resp = self.rsvp(self.users[2], "Going")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["status"], "Waitlisted")
+        self.assertIsNotNone(resp.json()["waitlisted_at"])
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 2)
+
+        # repeating "Going" does not take a second seat
+        self.rsvp(self.users[0], "Going")
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 2)
+
+    def test_not_going_promotes_waitlist_in_order(self):
+        extra = User.objects.create_user(username="guest3", password="pass12345")
+        for user in self.users + [extra]:
+            self.rsvp(user, "Going")
+
+        self.rsvp(self.users[0], "Not Going")
+        self.assertEqual(RSVP.objects.get(event=self.event, user=self.users[2]).status, "Going")
+        self.assertEqual(RSVP.objects.get(event=self.event, user=extra).status, "Waitlisted")
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 2)
+
+    def test_rsvp_update_view_goes_through_allocator(self):
+        self.rsvp(self.users[0], "Going")
+        self.rsvp(self.users[1], "Going")
+        self.rsvp(self.users[2], "Maybe")
+        client = APIClient()
+        client.force_authenticate(user=self.users[2])
+        patch_url = reverse("rsvp-update", kwargs={"event_pk": self.event.id, "user_pk": self.users[2].id})
+
+        resp = client.patch(patch_url, {"status": "Going"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["status"], "Waitlisted")
+
+        # users can't put themselves on (or jump) the waitlist directly
+        resp2 = client.patch(patch_url, {"status": "Waitlisted"}, format="json")
+        self.assertEqual(resp2.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_raising_capacity_promotes_waitlist(self):
+        for user in self.users:
+            self.rsvp(user, "Going")
+        client = APIClient()
+        client.force_authenticate(user=self.organizer)
+        resp = client.patch(reverse("events-detail", args=[self.event.id]), {"capacity": 3}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(RSVP.objects.get(event=self.event, user=self.users[2]).status, "Going")
+
+        # capacity can't drop below the seats already handed out
+        resp2 = client.patch(reverse("events-detail", args=[self.event.id]), {"capacity": 1}, format="json")
+        self.assertEqual(resp2.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_stale_event_update_does_not_overwrite_seat_counter(self):
+        # organizer loads the event before the seats are claimed
+        stale = Event.objects.get(pk=self.event.pk)
+        self.rsvp(self.users[0], "Going")
+        self.rsvp(self.users[1], "Going")
+
+        serializer = EventSerializer(stale, data={"title": "Renamed"}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.assertEqual(serializer.data["seats_taken"], 2)
+
+        # a plain save of a stale copy (as the admin change form does) must not reset it either
+        stale.save()
+        self.assertEqual(self.rsvp(self.users[2], "Going").json()["status"], "Waitlisted")
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.title, "Renamed")
+        self.assertEqual(self.event.seats_taken, 2)
+        self.assertEqual(RSVP.objects.filter(event=self.event, status="Going").count(), 2)
+
+    def test_stale_event_update_does_not_overwrite_capacity(self):
+        # copy A is loaded at capacity 2, then capacity is raised to 5 elsewhere
+        stale = Event.objects.get(pk=self.event.pk)
+        raise_cap = EventSerializer(Event.objects.get(pk=self.event.pk), data={"capacity": 5}, partial=True)
+        raise_cap.is_valid(raise_exception=True)
+        raise_cap.save()
+        guests = self.users + [User.objects.create_user(username=f"extra{i}", password="pass12345") for i in range(2)]
+        for user in guests:
+            self.assertEqual(self.rsvp(user, "Going").json()["status"], "Going")
+
+        # a title-only PATCH through copy A must not put capacity back to 2
+        serializer = EventSerializer(stale, data={"title": "Renamed"}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.assertEqual(serializer.data["capacity"], 5)
+        stale.save()
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.title, "Renamed")
+        self.assertEqual(self.event.capacity, 5)
+        self.assertEqual(self.event.seats_taken, 5)
+
+    def test_raising_capacity_promotes_within_the_update(self):
+        for user in self.users:
+            self.rsvp(user, "Going")
+        serializer = EventSerializer(self.event, data={"capacity": 3}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        # promotion is part of the serializer update itself, not a later step in the view
+        self.assertEqual(RSVP.objects.get(event=self.event, user=self.users[2]).status, "Going")
+        self.assertEqual(serializer.data["seats_taken"], 3)
+
+    def test_lowering_capacity_checks_current_seats(self):
+        stale = Event.objects.get(pk=self.event.pk)
+        self.rsvp(self.users[0], "Going")
+        self.rsvp(self.users[1], "Going")
+
+        # the stale copy still says seats_taken=0; the database says 2
+        serializer = EventSerializer(stale, data={"capacity": 1}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        with self.assertRaises(ValidationError):
+            serializer.save()
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.capacity, 2)
+
+
+    def test_deleting_going_rsvp_releases_seat_and_promotes(self):
+        for user in self.users:
+            self.rsvp(user, "Going")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            RSVP.objects.get(event=self.event, user=self.users[0]).delete()
+        self.assertEqual(RSVP.objects.get(event=self.event, user=self.users[2]).status, "Going")
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 2)
+
+        # cascade from deleting a user gives the seat back too
+        with self.captureOnCommitCallbacks(execute=True):
+            self.users[1].delete()
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 1)
+        self.assertEqual(RSVP.objects.filter(event=self.event, status="Going").count(), 1)
+
+        # deleting the whole event is fine as well
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.delete()
+        self.assertFalse(RSVP.objects.exists())
+
+    def test_deleting_organizer_releases_their_seats_elsewhere(self):
+        for user in self.users:
+            self.rsvp(user, "Going")
+        other = Event.objects.create(
+            title="Other",
+            organizer=self.users[0],
+            start_time=self.start,
+            end_time=self.start + timedelta(hours=2),
+            capacity=1
+        )
+        other_url = reverse("events-rsvp", args=[other.id])
+        for user in (self.organizer, self.users[1]):
+            client = APIClient()
+            client.force_authenticate(user=user)
+            client.post(other_url, {"status": "Going"}, format="json")
+        self.assertEqual(RSVP.objects.get(event=other, user=self.users[1]).status, "Waitlisted")
+
+        # the organizer's own event and its RSVPs cascade away; their seat elsewhere is freed
+        with self.captureOnCommitCallbacks(execute=True):
+            self.organizer.delete()
+        self.assertFalse(Event.objects.filter(pk=self.event.pk).exists())
+        other.refresh_from_db()
+        self.assertEqual(other.seats_taken, 1)
+        self.assertEqual(RSVP.objects.get(event=other, user=self.users[1]).status, "Going")
+
+        # a queryset delete of events is skipped the same way
+        with self.captureOnCommitCallbacks(execute=True):
+            Event.objects.all().delete()
+        self.assertFalse(RSVP.objects.exists())
+
+    def test_admin_rsvp_add_goes_through_allocator(self):
+        self.rsvp(self.users[0], "Going")
+        self.rsvp(self.users[1], "Going")
+        admin_user = User.objects.create_superuser(username="admin", password="pass12345", email="a@example.com")
+        self.client.force_login(admin_user)
+
+        resp = self.client.post(reverse("admin:events_rsvp_add"),
+                                {"event": self.event.id, "user": self.users[2].id, "status": "Going"})
+        self.assertEqual(resp.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(RSVP.objects.get(event=self.event, user=self.users[2]).status, "Waitlisted")
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 2)
+
+        # status can't be changed in the admin
+        rsvp = RSVP.objects.get(event=self.event, user=self.users[2])
+        self.client.post(reverse("admin:events_rsvp_change", args=[rsvp.id]), {"status": "Going"})
+        rsvp.refresh_from_db()
+        self.assertEqual(rsvp.status, "Waitlisted")
+
+    def test_admin_event_change_goes_through_set_capacity(self):
+        for user in self.users:
+            self.rsvp(user, "Going")
+        admin_user = User.objects.create_superuser(username="admin", password="pass12345", email="a@example.com")
+        self.client.force_login(admin_user)
+        url = reverse("admin:events_event_change", args=[self.event.id])
+
+        def form(capacity):
+            local_start = timezone.localtime(self.event.start_time)
+            local_end = timezone.localtime(self.event.end_time)
+            return {
+                "title": self.event.title, "description": "", "organizer": self.organizer.id, "location": "",
+                "start_time_0": local_start.strftime("%Y-%m-%d"), "start_time_1": local_start.strftime("%H:%M:%S"),
+                "end_time_0": local_end.strftime("%Y-%m-%d"), "end_time_1": local_end.strftime("%H:%M:%S"),
+                "is_public": "on", "capacity": capacity,
+            }
+
+        # below the seats taken: the form is shown again with the error and nothing changes
+        resp = self.client.post(url, form(1))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIn("capacity", resp.context["adminform"].form.errors)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.capacity, 2)
+
+        # raising it hands the new seat to the waitlist
+        resp = self.client.post(url, form(3))
+        self.assertEqual(resp.status_code, status.HTTP_302_FOUND)
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.capacity, self.event.seats_taken), (3, 3))
+        self.assertEqual(RSVP.objects.get(event=self.event, user=self.users[2]).status, "Going")
+
+
+class EventCapacityStressTestCase(TransactionTestCase):
+    """Many threads racing for the seats of one event must never oversell it."""
+
+    def test_concurrent_rsvps_do_not_oversell(self):
+        users = [User.objects.create(username=f"racer{i}") for i in range(60)]
+        start = timezone.now() + timedelta(days=1)
+        event = Event.objects.create(
+            title="Popular",
+            organizer=users[0],
+            start_time=start,
+            end_time=start + timedelta(hours=2),
+            capacity=20
+        )
+
+        stats = run_rsvp_stress(event, users, threads=8, rounds=2)
+
+        self.assertEqual(stats["requests"], 60 * 3)
+        self.assertEqual(stats["going"], 20)
+        self.assertEqual(stats["seats_taken"], 20)
+        self.assertEqual(stats["waitlisted"], 40)
+
+    def test_concurrent_claim_seat_on_stale_instance(self):
+        # no surrounding transaction, and every thread shares one instance whose
+        # seats_taken stays 0 in memory: only the conditional UPDATE can stop an oversell
+        organizer = User.objects.create(username="claimer")
+        start = timezone.now() + timedelta(days=1)
+        event = Event.objects.create(
+            title="Claims",
+            organizer=organizer,
+            start_time=start,
+            end_time=start + timedelta(hours=2),
+            capacity=20
+        )
+        stale = Event.objects.get(pk=event.pk)
+        claimed = []
+        errors = []
+        lock = threading.Lock()
+        start_gate = threading.Barrier(8)
+
+        def worker():
+            mine = 0
+            try:
+                start_gate.wait()
+                for _ in range(10):
+                    attempts = 0
+                    while True:
+                        try:
+                            mine += stale.claim_seat()
+                            break
+                        except OperationalError:
+                            # "database is locked": try the same claim again, up to a point
+                            attempts += 1
+                            if attempts > MAX_RETRIES:
+                                raise
+                            time.sleep(RETRY_DELAY)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+                with lock:
+                    claimed.append(mine)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        event.refresh_from_db()
+        self.assertEqual(sum(claimed), 20)
+        self.assertEqual(event.seats_taken, 20)
+        self.assertEqual(stale.seats_taken, 0)
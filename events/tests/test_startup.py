@@ -0,0 +1,45 @@
+# events/tests/test_startup.py
+import gc
+import json
+import os
+from io import StringIO
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from event_api.preload import warm
+from events.management.commands.startup_profile import parse_importtime, run_forked
+
+
+class StartupProfileTestCase(SimpleTestCase):
+    def test_preload_warm(self):
+        self.addCleanup(gc.unfreeze)
+        warm()
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+    def test_parse_importtime(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   django.utils\n"
+            "import time:      2000 |       2120 | django\n"
+        )
+        self.assertEqual(parse_importtime(output), [("django.utils", 120, 120), ("django", 2000, 2120)])
+
+    def test_startup_profile_reports_cold_start(self):
+        out = StringIO()
+        call_command("startup_profile", target="wsgi", repeat=1, json=True, stdout=out)
+        result = json.loads(out.getvalue())["wsgi"]
+        self.assertEqual(result["module"], "event_api.wsgi")
+        self.assertGreater(result["cold_start_ms"]["median"], 0)
+        self.assertGreater(result["modules_imported"], 0)
+        self.assertIn("django", result["packages_ms"])
+
+    @skipUnless(hasattr(os, "fork"), "needs fork()")
+    def test_forked_worker_failure_is_reported(self):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        self.assertEqual(len(run_forked("event_api.wsgi", "/api/events/", env, 2)), 2)
+        with self.assertRaisesMessage(CommandError, "forked worker for event_api.wsgi exited with 1"):
+            run_forked("event_api.wsgi", "/no/such/url/", env, 1)
@@ -11,6 +11,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from .models import Event, RSVP, Review
 from .serializers import EventSerializer, RSVPSerializer, ReviewSerializer
 from .permissions import IsOrganizerOrReadOnly, IsInvitedOrPublic
+from .services import RSVPConflict, set_rsvp_status
 
 
 class EventViewSet(viewsets.ModelViewSet):
@@ -66,18 +67,19 @@ class EventViewSet(viewsets.ModelViewSet):
         POST /events/{id}/rsvp/
         Body: {"status": "Going" | "Maybe" | "Not Going"}
         Creates or updates the authenticated user's RSVP for the event.
+        "Going" on a full event puts the RSVP on the waitlist ("Waitlisted").
         """
         event = self.get_object()
         status_val = request.data.get('status')
-        if status_val not in dict(RSVP.STATUS_CHOICES):
+        if status_val not in RSVP.REQUESTABLE_STATUSES:
             return Response({'detail': 'invalid status (choose Going / Maybe / Not Going)'},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        rsvp, created = RSVP.objects.update_or_create(
-            event=event,
-            user=request.user,
-            defaults={'status': status_val}
-        )
+        try:
+            rsvp = set_rsvp_status(event, request.user, status_val)
+        except RSVPConflict:
+            return Response({'detail': 'RSVP was changed by another request, please retry'},
+                            status=status.HTTP_409_CONFLICT)
         return Response(RSVPSerializer(rsvp, context={'request': request}).data)
 
     @action(detail=True, methods=['get', 'post'], url_path='reviews', permission_classes=[AllowAny])
@@ -128,5 +130,11 @@ class RSVPUpdateView(viewsets.ViewSet):
 
         serializer = RSVPSerializer(rsvp, data=request.data, partial=True, context={'request': request})
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data)
+        if 'status' in serializer.validated_data:
+            # go through the seat allocator rather than saving the status directly
+            try:
+                rsvp = set_rsvp_status(event, rsvp.user, serializer.validated_data['status'])
+            except RSVPConflict:
+                return Response({'detail': 'RSVP was changed by another request, please retry'},
+                                status=status.HTTP_409_CONFLICT)
+        return Response(RSVPSerializer(rsvp, context={'request': request}).data)
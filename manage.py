@@ -11,6 +11,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
+    if len(sys.argv) > 1 and sys.argv[1] == "test":
+        # in-memory DB, squashed migrations, fast password hashing
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "event_api.settings_test")
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "event_api.settings")
     try:
         from django.core.management import execute_from_command_line